@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Constants
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fsx_to_s3_int")
+DEFAULT_TTL = 900  # 15 minutes in seconds
+
+def _encode(value):
+    """Serializes the datetimes boto3 returns in responses as UTC epoch seconds."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.timestamp()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode(value):
+    """Restores datetimes serialized by _encode (datetime.fromisoformat needs Python 3.7+)."""
+    if "__datetime__" in value:
+        return datetime.fromtimestamp(value["__datetime__"], timezone.utc)
+    return value
+
+def snap_time(when, ttl=DEFAULT_TTL):
+    """Rounds a datetime down to a ttl-second boundary so requests within one TTL window coincide."""
+    # Snap to whole minutes so the result stays on the minute boundaries CloudWatch aligns buckets to
+    bucket = max(60, ttl // 60 * 60)
+    return datetime.fromtimestamp(when.timestamp() // bucket * bucket, timezone.utc)
+
+def prune(ttl=DEFAULT_TTL, cache_dir=CACHE_DIR):
+    """Deletes cache entries, and temporary files left by interrupted writes, older than ttl seconds."""
+    cutoff = time.time() - ttl
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # Another thread or process may have removed it first
+
+def cache_key(*parts):
+    """Hashes the parts of a request into a stable cache file name."""
+    payload = json.dumps(parts, sort_keys=True, default=_encode)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def cached_call(func, request, ttl=DEFAULT_TTL, namespace=None, cache_dir=CACHE_DIR):
+    """Calls func(**request), reusing a response cached on disk less than ttl seconds ago."""
+    if ttl <= 0:
+        return func(**request)
+
+    path = os.path.join(cache_dir, cache_key(namespace, request) + ".json")
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            with open(path) as f:
+                return json.load(f, object_hook=_decode)
+    except (OSError, ValueError):
+        pass  # Missing, unreadable or corrupt entries are simply refetched
+
+    response = func(**request)
+
+    # Write to a temporary file first so concurrent readers never see a partial entry
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(response, f, default=_encode)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Caching is best effort; the fresh response is still returned
+
+    # Expired entries can never be read again, since their requests carry an older snapped end time
+    prune(ttl, cache_dir)
+
+    return response
@@ -1,26 +1,48 @@
-import boto3
 import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from cache import DEFAULT_TTL, cached_call, snap_time
 
 # Constants
 BYTES_TO_TB = 1_099_511_627_776  # 1 TB = 1024^4 bytes
 BYTES_TO_GB = 1_073_741_824      # 1 GB = 1024^3 bytes
 BYTES_TO_MB = 1_048_576          # 1 MB = 1024^2 bytes
+GB_PER_BYTE = 1 / BYTES_TO_GB    # Exact reciprocal (power of two), so multiplying matches dividing
 SECONDS_IN_DAY = 86400
 HOUR = 3600  # 1 hour in seconds
 DAY = 86400  # 24 hours in seconds
 HOURS_PER_MONTH = 730   # Average number of hours in a month
 DAYS_PER_MONTH = 30    # Average days in a month
 
-def get_metric(client, metric_name, fsx_id, volume_id, days=1, stat="Average", storage_tier=None, data_type=None, period=None):
-    """Fetches CloudWatch metrics for the FSx volume."""
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(days=days)
-    
-    # Calculate appropriate period based on time range to stay under 1440 datapoints
-    if period is None:
-        min_period = (days * 24 * 60 * 60) // 1400
-        period = max(300, ((min_period + 59) // 60) * 60)
+MAX_QUERIES_PER_CALL = 500  # GetMetricData limit on MetricDataQueries per request
+MAX_VOLUME_WORKERS = 8      # Volumes analyzed concurrently in --volume-ids mode
+MAX_CACHE_TTL = HOUR        # Longer TTLs would snap the end time too far into the past
+
+# The only statistics the estimates consume; each query requests exactly one of them
+SUPPORTED_STATS = {"Sum", "Average", "Maximum"}
+
+# StorageUsed DataType dimension values, keyed by query Id
+STORAGE_DATA_TYPES = {"u": "User", "s": "Snapshot", "o": "Other"}
+
+def get_period(days):
+    """Calculates a period that keeps the time range under 1440 datapoints."""
+    min_period = (days * 24 * 60 * 60) // 1400
+    return max(300, ((min_period + 59) // 60) * 60)
+
+def floor_minute(when):
+    """Truncates a datetime to the whole minute, as GetMetricData does to recent start times."""
+    return when.replace(second=0, microsecond=0)
+
+def safe_divide(numerator, denominator, default=0):
+    """Divides, returning default when the denominator is zero or negative."""
+    return numerator / denominator if denominator > 0 else default
+
+def metric_query(query_id, metric_name, fsx_id, volume_id, stat="Average", period=300, storage_tier=None, data_type=None):
+    """Builds a GetMetricData query for an FSx volume metric."""
+    # GetMetricData is billed per metric requested, so never ask for statistics that go unused
+    if stat not in SUPPORTED_STATS:
+        raise ValueError(f"Unsupported statistic {stat!r} for {metric_name}; expected one of {sorted(SUPPORTED_STATS)}")
     
     dimensions = [
         {"Name": "FileSystemId", "Value": fsx_id},
@@ -35,54 +57,100 @@ def get_metric(client, metric_name, fsx_id, volume_id, days=1, stat="Average", s
     if data_type and metric_name == "StorageUsed":
         dimensions.append({"Name": "DataType", "Value": data_type})
     
-    response = client.get_metric_statistics(
-        Namespace="AWS/FSx",
-        MetricName=metric_name,
-        Dimensions=dimensions,
-        StartTime=start_time.isoformat(),
-        EndTime=end_time.isoformat(),
-        Period=period,
-        Statistics=[stat]
-    )
+    return {
+        "Id": query_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": "AWS/FSx",
+                "MetricName": metric_name,
+                "Dimensions": dimensions
+            },
+            "Period": period,
+            "Stat": stat
+        },
+        "ReturnData": True
+    }
+
+def get_metric_data(client, queries, start_time, end_time, cache_ttl=0, cache_namespace=None):
+    """Fetches a batch of CloudWatch metric queries, returning results keyed by query Id."""
+    query_ids = set()
+    for query in queries:
+        if query["Id"] in query_ids:
+            raise ValueError(f"Duplicate query Id {query['Id']!r}; each Id must request a single statistic")
+        query_ids.add(query["Id"])
+    
+    results = {}
+    for i in range(0, len(queries), MAX_QUERIES_PER_CALL):
+        kwargs = {
+            "MetricDataQueries": queries[i:i + MAX_QUERIES_PER_CALL],
+            "StartTime": start_time,
+            "EndTime": end_time,
+            "ScanBy": "TimestampDescending"
+        }
+        while True:
+            # cache_namespace identifies the profile and region behind client, so cached
+            # responses are never shared between accounts
+            response = cached_call(client.get_metric_data, kwargs, ttl=cache_ttl,
+                                   namespace=cache_namespace)
+            for result in response["MetricDataResults"]:
+                # Results for the same query can be split across pages
+                merged = results.setdefault(result["Id"], {"Timestamps": [], "Values": []})
+                merged["Timestamps"].extend(result.get("Timestamps", []))
+                merged["Values"].extend(result.get("Values", []))
+            if not response.get("NextToken"):
+                break
+            kwargs["NextToken"] = response["NextToken"]
     
-    if not response.get("Datapoints"):
+    return results
+
+def get_metric(results, query_id, metric_name, stat="Average", period=300):
+    """Extracts a single value for a metric from GetMetricData results."""
+    values = results.get(query_id, {}).get("Values")
+    if not values:
         return 0
         
     if stat == "Sum":
-        total = sum(point[stat] for point in response["Datapoints"])
+        total = sum(values)
         if "TotalClientThroughput" in metric_name:
             # Convert bytes to GB and account for the period
-            return (total * period) / BYTES_TO_GB
+            return total * period * GB_PER_BYTE
         elif "Bytes" in metric_name or metric_name in ["StorageCapacity", "StorageUsed"]:
-            return total / BYTES_TO_GB  # Convert bytes to GB
+            return total * GB_PER_BYTE  # Convert bytes to GB
         return total
     else:
-        latest_point = max(response["Datapoints"], key=lambda x: x['Timestamp'])
+        # Values are ordered newest first (ScanBy=TimestampDescending)
+        latest_value = values[0]
         if "TotalClientThroughput" in metric_name:
             # Convert bytes/second to GB for the period
-            return (latest_point[stat] * period) / BYTES_TO_GB
+            return latest_value * period * GB_PER_BYTE
         elif "Bytes" in metric_name or metric_name in ["StorageCapacity", "StorageUsed"]:
-            return latest_point[stat] / BYTES_TO_GB  # Convert bytes to GB
-        return latest_point[stat]
+            return latest_value * GB_PER_BYTE  # Convert bytes to GB
+        return latest_value
+
+def storage_metric_queries(fsx_id, volume_id, period=300):
+    """Builds the queries needed by get_storage_metrics."""
+    return [
+        metric_query("storage_capacity", "StorageCapacity", fsx_id, volume_id,
+                     stat="Average", period=period),
+        metric_query("files_capacity", "FilesCapacity", fsx_id, volume_id,
+                     stat="Maximum", period=period)
+    ] + [
+        # One StorageUsed series per DataType, all returned by the same request
+        metric_query(query_id, "StorageUsed", fsx_id, volume_id,
+                     stat="Average", period=period, storage_tier="All", data_type=data_type)
+        for query_id, data_type in STORAGE_DATA_TYPES.items()
+    ]
 
-def get_storage_metrics(client, fsx_id, volume_id):
+def get_storage_metrics(results):
     """Gets detailed storage metrics matching the CloudWatch console."""
     
     # Get total storage capacity
-    storage_capacity = get_metric(client, "StorageCapacity", fsx_id, volume_id, 
-                                stat="Average", storage_tier=None, data_type=None)
-    
-    # Get user data storage
-    user_storage = get_metric(client, "StorageUsed", fsx_id, volume_id,
-                            stat="Average", storage_tier="All", data_type="User")
-    
-    # Get snapshot data storage
-    snapshot_storage = get_metric(client, "StorageUsed", fsx_id, volume_id,
-                                stat="Average", storage_tier="All", data_type="Snapshot")
+    storage_capacity = get_metric(results, "storage_capacity", "StorageCapacity", stat="Average")
     
-    # Get other data storage
-    other_storage = get_metric(client, "StorageUsed", fsx_id, volume_id,
-                             stat="Average", storage_tier="All", data_type="Other")
+    # Get user, snapshot and other data storage
+    user_storage, snapshot_storage, other_storage = (
+        get_metric(results, query_id, "StorageUsed", stat="Average") for query_id in STORAGE_DATA_TYPES
+    )
     
     return {
         'capacity': storage_capacity,
@@ -90,192 +158,233 @@ def get_storage_metrics(client, fsx_id, volume_id):
         'snapshot_data': snapshot_storage,
         'other_data': other_storage,
         'available': storage_capacity - user_storage - snapshot_storage - other_storage,
-        'utilization': (user_storage + snapshot_storage + other_storage) / storage_capacity * 100 if storage_capacity > 0 else 0,
-        'files_capacity': get_metric(client, "FilesCapacity", fsx_id, volume_id, stat="Maximum")
+        'utilization': safe_divide((user_storage + snapshot_storage + other_storage) * 100, storage_capacity),
+        'files_capacity': get_metric(results, "files_capacity", "FilesCapacity", stat="Maximum")
     }
 
-def get_throughput_metric(client, fsx_id, volume_id, days=1):
-    """Fetches combined read and write throughput for the period."""
-    # Limit days to 14 since that's our max historical data
-    days = min(days, 14)
-    
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(days=days)
-    
-    # Calculate appropriate period
-    min_period = (days * 24 * 60 * 60) // 1400
-    period = max(300, ((min_period + 59) // 60) * 60)
-    
-    dimensions = [
-        {"Name": "FileSystemId", "Value": fsx_id},
-        {"Name": "VolumeId", "Value": volume_id}
+def sum_values(result, start_time=None):
+    """Sums a GetMetricData result, optionally only the datapoints at or after start_time."""
+    values = result.get("Values", [])
+    if start_time is not None:
+        # Datapoints are ordered newest first (ScanBy=TimestampDescending), so the ones
+        # since start_time are a prefix and can be summed as a slice without a per-point filter
+        timestamps = result.get("Timestamps", [])
+        count = next((i for i, timestamp in enumerate(timestamps) if timestamp < start_time), len(timestamps))
+        values = values[:count]
+    return sum(values)
+
+def throughput_metric_queries(fsx_id, volume_id, period=SECONDS_IN_DAY):
+    """Builds the read and write queries needed by get_throughput_metric."""
+    return [
+        metric_query("read_bytes", "DataReadBytes", fsx_id, volume_id, stat="Sum", period=period),
+        metric_query("write_bytes", "DataWriteBytes", fsx_id, volume_id, stat="Sum", period=period)
     ]
-    
-    # Get read bytes
-    read_response = client.get_metric_statistics(
-        Namespace="AWS/FSx",
-        MetricName="DataReadBytes",
-        Dimensions=dimensions,
-        StartTime=start_time,
-        EndTime=end_time,
-        Period=period,
-        Statistics=["Sum"]
-    )
-    
-    # Get write bytes
-    write_response = client.get_metric_statistics(
-        Namespace="AWS/FSx",
-        MetricName="DataWriteBytes",
-        Dimensions=dimensions,
-        StartTime=start_time,
-        EndTime=end_time,
-        Period=period,
-        Statistics=["Sum"]
-    )
-    
+
+def get_throughput_metric(results, start_time=None):
+    """Calculates combined read and write throughput, optionally only since start_time."""
     # Sum up total bytes transferred
     total_bytes = 0
-    if read_response.get("Datapoints"):
-        total_bytes += sum(point["Sum"] for point in read_response["Datapoints"])
-    if write_response.get("Datapoints"):
-        total_bytes += sum(point["Sum"] for point in write_response["Datapoints"])
+    total_bytes += sum_values(results.get("read_bytes", {}), start_time)
+    total_bytes += sum_values(results.get("write_bytes", {}), start_time)
     
-    return total_bytes / BYTES_TO_GB
+    return total_bytes * GB_PER_BYTE
 
-def get_select_metrics(client, fsx_id, volume_id, days=14):
-    """Calculates S3 Select-like metrics from FSx read/write operations."""
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(days=days)
-    
-    # Calculate period to stay under 1440 datapoints
-    # Total seconds / 1440 = minimum period
-    total_seconds = days * 24 * 60 * 60
-    min_period = total_seconds // 1440
-    # Round up to nearest 60 seconds
-    period = max(300, ((min_period + 59) // 60) * 60)
-    
-    dimensions = [
-        {"Name": "FileSystemId", "Value": fsx_id},
-        {"Name": "VolumeId", "Value": volume_id}
-    ]
-    
-    # Get data read bytes
-    read_bytes_response = client.get_metric_statistics(
-        Namespace="AWS/FSx",
-        MetricName="DataReadBytes",
-        Dimensions=dimensions,
-        StartTime=start_time,
-        EndTime=end_time,
-        Period=period,
-        Statistics=["Sum"]
-    )
-    
-    # Calculate totals
-    total_read = sum(point["Sum"] for point in read_bytes_response.get("Datapoints", [])) / BYTES_TO_GB
-    
+def get_select_metrics(read_bytes, days=14):
+    """Calculates S3 Select-like metrics from the GB read over the period."""
     # Calculate averages and projections
-    daily_scanned = total_read / days
+    daily_scanned = read_bytes / days
     monthly_scanned = daily_scanned * DAYS_PER_MONTH
     monthly_returned = monthly_scanned * 0.3  # 30% estimate
     
     return monthly_scanned, monthly_returned
 
+def compute_tiers(user_data, read_7d, read_14d):
+    """Estimates the S3 Intelligent-Tiering access tier percentages from recent reads."""
+    if user_data <= 0:
+        return 0, 0, 0
+    
+    # Frequent Access: Data accessed in last 7 days
+    frequent_access = min(100, read_7d / user_data * 100)
+    
+    # Infrequent Access: Data accessed between 7-14 days
+    infrequent_access = min(100 - frequent_access, (read_14d - read_7d) / user_data * 100)
+    
+    # Deep Archive: Remaining data (since we can't determine older access patterns)
+    deep_archive = max(0, 100 - frequent_access - infrequent_access)
+    
+    return frequent_access, infrequent_access, deep_archive
+
+def analyze_volume(client, fsx_id, volume_id, end_time, cache_ttl=0, cache_namespace=None):
+    """Collects the metrics for one FSx volume and derives the S3 Intelligent-Tiering estimates."""
+    # GetMetricData rounds start times under 15 days old down to the minute and aligns buckets to
+    # that, so use the same rounding for the 7-day cut-off to land it on a 14-day bucket edge
+    start_times = {days: floor_minute(end_time - timedelta(days=days)) for days in (1, 7, 14)}
+    period = get_period(1)
+
+    # Get metrics, batching every query that shares a time range into one GetMetricData request.
+    # Sums only need one total, so they use daily buckets: the sum of sums is the same at any
+    # period, with far fewer datapoints to transfer and parse.
+    daily_queries = storage_metric_queries(fsx_id, volume_id, period=period) + [
+        metric_query("files_used", "FilesUsed", fsx_id, volume_id, stat="Average", period=period),
+        metric_query("write_ops", "DataWriteOperations", fsx_id, volume_id, stat="Sum", period=SECONDS_IN_DAY),
+        metric_query("read_ops", "DataReadOperations", fsx_id, volume_id, stat="Sum", period=SECONDS_IN_DAY),
+        metric_query("metadata_ops", "MetadataOperations", fsx_id, volume_id, stat="Sum", period=SECONDS_IN_DAY)
+    ]
+    fortnightly_queries = throughput_metric_queries(fsx_id, volume_id, period=SECONDS_IN_DAY)
+    batches = [
+        ("daily", daily_queries, 1),
+        # Limited to 14 days since that's our max historical data; shorter windows are derived from it
+        ("fortnightly", fortnightly_queries, 14)
+    ]
+
+    # Issue the requests concurrently so total latency is the slowest call rather than the sum
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        futures = {
+            executor.submit(get_metric_data, client, queries, start_times[days], end_time,
+                            cache_ttl, cache_namespace): label
+            for label, queries, days in batches
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    daily_results = results["daily"]
+    fortnightly_results = results["fortnightly"]
+
+    storage_metrics = get_storage_metrics(daily_results)
+    files_used = get_metric(daily_results, "files_used", "FilesUsed", stat="Average")
+    write_ops = get_metric(daily_results, "write_ops", "DataWriteOperations", stat="Sum", period=SECONDS_IN_DAY)
+    read_ops = get_metric(daily_results, "read_ops", "DataReadOperations", stat="Sum", period=SECONDS_IN_DAY)
+    metadata_ops = get_metric(daily_results, "metadata_ops", "MetadataOperations", stat="Sum", period=SECONDS_IN_DAY)
+    data_read_bytes_7d = get_throughput_metric(fortnightly_results, start_time=start_times[7])
+    data_read_bytes_14d = get_throughput_metric(fortnightly_results)
+    read_bytes_14d = sum_values(fortnightly_results.get("read_bytes", {})) * GB_PER_BYTE
+    monthly_data_scanned, monthly_data_returned = get_select_metrics(read_bytes_14d)
+
+    frequent_access, infrequent_access, deep_archive = compute_tiers(
+        storage_metrics['user_data'], data_read_bytes_7d, data_read_bytes_14d
+    )
+
+    return {
+        'storage_metrics': storage_metrics,
+        'avg_object_size_mb': safe_divide(storage_metrics['user_data'] * 1024, files_used, default=16),  # Default to 16MB
+        'frequent_access': frequent_access,
+        'infrequent_access': infrequent_access,
+        'deep_archive': deep_archive,
+        # Calculate daily averages
+        'daily_avg_7d': data_read_bytes_7d / 7,
+        'daily_avg_14d': data_read_bytes_14d / 14,
+        # Convert hourly operations to monthly
+        'monthly_write_ops': write_ops * HOURS_PER_MONTH,
+        'monthly_read_ops': read_ops * HOURS_PER_MONTH,
+        'monthly_metadata_ops': metadata_ops * DAYS_PER_MONTH,
+        'monthly_data_scanned': monthly_data_scanned,
+        'monthly_data_returned': monthly_data_returned
+    }
+
+def print_report(report, fsx_id, volume_id, region):
+    """Prints the estimates for one FSx volume."""
+    storage_metrics = report['storage_metrics']
+
+    # Build the whole report first so it is written with a single call
+    lines = [
+        "=" * 80,
+        "\n📊 FSxN Volume Metrics for S3 Intelligent-Tiering Cost Estimation 📊",
+        "=" * 80,
+
+        # Volume Information
+        "\n🔹 Volume Information:",
+        f"   FSxN File System ID: {fsx_id}",
+        f"   FSxN Volume ID: {volume_id}",
+        f"   Region: {region}",
+
+        # Storage Information
+        "\n📦 Storage Information:",
+        f"   Total Storage Used: {storage_metrics['user_data']:,.2f} GB",
+        f"   Average Object Size: {report['avg_object_size_mb']:.2f} MB",
+
+        # Storage Tiers
+        "\n📊 Storage Tiers (based on available 14-day history):",
+        f"   - Frequent Access: {report['frequent_access']:.2f}%",
+        f"   - Infrequent Access: {report['infrequent_access']:.2f}%",
+        f"   - Deep Archive Access: {report['deep_archive']:.2f}%",
+
+        # Access Patterns
+        "\n📊 Access Patterns (based on available 14-day history):",
+        f"   - Last 7 Days: {report['daily_avg_7d']:.2f} GB/day",
+        f"   - Last 14 Days: {report['daily_avg_14d']:.2f} GB/day",
+
+        # Operations
+        "\nOperation Counts (based on hourly metrics, projected monthly):",
+        f"   PUT, COPY, POST, LIST Requests: {report['monthly_write_ops']:,.0f}",
+        f"   GET, SELECT, and Other Read Requests: {report['monthly_read_ops']:,.0f}",
+        f"   Lifecycle Transitions: {report['monthly_metadata_ops']:,.0f}",
+
+        # S3 Select
+        "\n📊 S3 Select Usage (projected monthly based on 14-day history):",
+        f"   Data Scanned: {report['monthly_data_scanned']:.2f} GB/month",
+        f"   Data Returned: {report['monthly_data_returned']:.2f} GB/month (estimated as 30% of scanned data)",
+
+        "\n" + "=" * 80,
+        "\n✅ Use these values in the AWS Pricing Calculator for S3 Intelligent-Tiering!",
+        "\n" + "=" * 80
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
 def main():
     parser = argparse.ArgumentParser(description="Calculate FSx to S3 INT metrics")
     parser.add_argument("--fsx-id", required=True, help="FSx File System ID")
-    parser.add_argument("--volume-id", required=True, help="FSx Volume ID")
+    volume_group = parser.add_mutually_exclusive_group(required=True)
+    volume_group.add_argument("--volume-id", help="FSx Volume ID")
+    volume_group.add_argument("--volume-ids", help="Comma-separated FSx Volume IDs to analyze in parallel")
     parser.add_argument("--region", required=True, help="AWS Region")
     parser.add_argument("--profile", required=True, help="AWS Profile")
+    parser.add_argument("--cache-ttl", type=int, default=DEFAULT_TTL,
+                        help=f"Seconds to reuse cached CloudWatch responses, 0 to disable, "
+                             f"at most {MAX_CACHE_TTL} (default: {DEFAULT_TTL})")
     args = parser.parse_args()
+    if not 0 <= args.cache_ttl <= MAX_CACHE_TTL:
+        parser.error(f"--cache-ttl must be between 0 and {MAX_CACHE_TTL} seconds")
+    # Duplicates are dropped, keeping the order the volumes were given in
+    volume_ids = list(dict.fromkeys(
+        volume_id.strip() for volume_id in args.volume_ids.split(",") if volume_id.strip()
+    )) if args.volume_ids else [args.volume_id]
+    if not volume_ids:
+        parser.error("--volume-ids must list at least one volume ID")
+
+    # Imported after parsing so --help and usage errors don't pay for loading boto3
+    import boto3
+    from botocore.config import Config
 
     # Initialize AWS session
     session = boto3.Session(profile_name=args.profile, region_name=args.region)
-    cloudwatch = session.client("cloudwatch")
-
-    # Get metrics
-    storage_metrics = get_storage_metrics(cloudwatch, args.fsx_id, args.volume_id)
-    files_used = get_metric(cloudwatch, "FilesUsed", args.fsx_id, args.volume_id, stat="Average")
-    write_ops = get_metric(cloudwatch, "DataWriteOperations", args.fsx_id, args.volume_id, stat="Sum", period=300)
-    read_ops = get_metric(cloudwatch, "DataReadOperations", args.fsx_id, args.volume_id, stat="Sum", period=300)
-    metadata_ops = get_metric(cloudwatch, "MetadataOperations", args.fsx_id, args.volume_id, stat="Sum", period=300)
-    data_read_bytes_7d = get_throughput_metric(cloudwatch, args.fsx_id, args.volume_id, days=7)
-    data_read_bytes_14d = get_throughput_metric(cloudwatch, args.fsx_id, args.volume_id, days=14)
-    monthly_data_scanned, monthly_data_returned = get_select_metrics(cloudwatch, args.fsx_id, args.volume_id)
-
-    # Calculate daily averages
-    daily_avg_7d = data_read_bytes_7d / 7
-    daily_avg_14d = data_read_bytes_14d / 14
+    # One client is shared by all worker threads: keepalive and a pool sized for the volume workers'
+    # concurrent requests keep warm connections reusable, and adaptive retries absorb throttling.
+    # Requests are built by this script, so client-side parameter validation is skipped.
+    cloudwatch = session.client("cloudwatch", config=Config(
+        tcp_keepalive=True,
+        max_pool_connections=16,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        parameter_validation=False
+    ))
+
+    # Compute the end time once so every request in a run shares it. It is kept on a whole minute so
+    # the time ranges line up with CloudWatch's minute-rounded buckets, and when caching it is snapped
+    # to the TTL so re-runs within one TTL window send identical, cacheable requests.
+    end_time = floor_minute(datetime.now(timezone.utc))
+    if args.cache_ttl > 0:
+        end_time = snap_time(end_time, args.cache_ttl)
 
     # Use the 14-day average for longer periods (with a warning)
     print("\nNote: Historical data is limited to 14 days. Using 14-day average for longer periods.")
 
-    # Compute Storage Tiers
-    if storage_metrics['user_data']:
-        # Frequent Access: Data accessed in last 7 days
-        frequent_access = min(100, (data_read_bytes_7d / storage_metrics['user_data'] * 100) if storage_metrics['user_data'] > 0 else 0)
-        
-        # Infrequent Access: Data accessed between 7-14 days
-        infrequent_access = min(100 - frequent_access,
-                               ((data_read_bytes_14d - data_read_bytes_7d) / storage_metrics['user_data'] * 100) if storage_metrics['user_data'] > 0 else 0)
-        
-        # Deep Archive: Remaining data (since we can't determine older access patterns)
-        deep_archive = max(0, 100 - frequent_access - infrequent_access)
-        
-        # Set Archive tiers to 0 since we don't have enough historical data
-        archive_instant = 0
-        archive = 0
-    else:
-        frequent_access = infrequent_access = archive_instant = archive = deep_archive = 0
-
-    avg_object_size_mb = (storage_metrics['user_data'] * 1024) / files_used if files_used else 16  # Default to 16MB
-
-    # Convert hourly operations to monthly
-    monthly_write_ops = write_ops * HOURS_PER_MONTH
-    monthly_read_ops = read_ops * HOURS_PER_MONTH
-    monthly_metadata_ops = metadata_ops * DAYS_PER_MONTH
-
-    # Print Results
-    print("=" * 80)
-    print("\n📊 FSxN Volume Metrics for S3 Intelligent-Tiering Cost Estimation 📊")
-    print("=" * 80)
-
-    # Volume Information
-    print("\n🔹 Volume Information:")
-    print(f"   FSxN File System ID: {args.fsx_id}")
-    print(f"   FSxN Volume ID: {args.volume_id}")
-    print(f"   Region: {args.region}")
-
-    # Storage Information
-    print("\n📦 Storage Information:")
-    print(f"   Total Storage Used: {storage_metrics['user_data']:,.2f} GB")
-    print(f"   Average Object Size: {avg_object_size_mb:.2f} MB")
-
-    # Storage Tiers
-    print("\n📊 Storage Tiers (based on available 14-day history):")
-    print(f"   - Frequent Access: {frequent_access:.2f}%")
-    print(f"   - Infrequent Access: {infrequent_access:.2f}%")
-    print(f"   - Deep Archive Access: {deep_archive:.2f}%")
-
-    # Access Patterns
-    print("\n📊 Access Patterns (based on available 14-day history):")
-    print(f"   - Last 7 Days: {daily_avg_7d:.2f} GB/day")
-    print(f"   - Last 14 Days: {daily_avg_14d:.2f} GB/day")
-
-    # Operations
-    print("\nOperation Counts (based on hourly metrics, projected monthly):")
-    print(f"   PUT, COPY, POST, LIST Requests: {monthly_write_ops:,.0f}")
-    print(f"   GET, SELECT, and Other Read Requests: {monthly_read_ops:,.0f}")
-    print(f"   Lifecycle Transitions: {monthly_metadata_ops:,.0f}")
-
-    # S3 Select
-    print("\n📊 S3 Select Usage (projected monthly based on 14-day history):")
-    print(f"   Data Scanned: {monthly_data_scanned:.2f} GB/month")
-    print(f"   Data Returned: {monthly_data_returned:.2f} GB/month (estimated as 30% of scanned data)")
-
-    print("\n" + "=" * 80)
-    print("\n✅ Use these values in the AWS Pricing Calculator for S3 Intelligent-Tiering!")
-    print("\n" + "=" * 80)
+    # Analyze volumes in parallel, then print the reports from this thread in the order given
+    def analyze(volume_id):
+        return analyze_volume(cloudwatch, args.fsx_id, volume_id, end_time,
+                              args.cache_ttl, (args.profile, args.region))
+
+    with ThreadPoolExecutor(max_workers=MAX_VOLUME_WORKERS) as executor:
+        for volume_id, report in zip(volume_ids, executor.map(analyze, volume_ids)):
+            print_report(report, args.fsx_id, volume_id, args.region)
 
 if __name__ == "__main__":
     main()
-